@@ -1,8 +0,0 @@
-"""
-Rufus Web Crawler - An intelligent web scraper with AI content analysis
-"""
-
-from .client import RufusClient
-
-__version__ = "0.1.0"
-__all__ = ["RufusClient"]
\ No newline at end of file
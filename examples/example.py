@@ -1,13 +1,17 @@
 import asyncio
-import json
+import io
+import shutil
 import sys
+import orjson
+from rufus.ai_processor import openai_session
 from rufus.client import RufusClient
+from rufus.llm_cache import LLMCache
 
 async def main():
     url = "https://www.dennys.com"
     instructions = "get the details of burgers"
     
-    client = RufusClient()
+    client = RufusClient(llm_cache=LLMCache())
     
     min_score_threshold = 60
     stop_score_threshold = 100
@@ -15,12 +19,12 @@ async def main():
     print(f"Starting scraping of {url} with instructions: {instructions}")
     print(f"Will collect pages with score >= {min_score_threshold} and stop at {stop_score_threshold}")
 
-    collected_pages = await client.scrape_with_score_criteria(
+    collected_pages = await client.scrape_with_cumulative_score(
         url=url, 
         instructions=instructions, 
         max_depth=2,
         min_score=min_score_threshold,
-        stop_score=stop_score_threshold
+        cumulative_score_threshold=stop_score_threshold
     )
     
     if not collected_pages:
@@ -29,56 +33,74 @@ async def main():
     
     print(f"Collected {len(collected_pages)} pages with scores between {min_score_threshold} and {stop_score_threshold}+")
     
-    processed_results = []
-    for page in collected_pages:
-        print(f"Processing page: {page['url']} (score: {page['relevance_score']})")
-
-        focused_prompt = f"Based on the following content from {page['url']}, {instructions}"
-        
-        processed = await client.ai_processor.process_content(page, focused_prompt)
-        processed['source_url'] = page['url']
-        processed['relevance_score'] = page['relevance_score']
-        processed_results.append(processed)
-
-    final_result = {}
-    if processed_results:
-        print("Generating final AI summary from all collected pages...")
-
-        combined_data = {
-            "content": "\n\n".join([
-                f"--- From {result['source_url']} (Score: {result['relevance_score']}) ---\n{result['summary']}"
-                for result in processed_results
-            ])
-        }
-        
-        final_result = await client.ai_processor.process_content(
-            combined_data,
-            f"Based on the following information from multiple pages about {instructions}, provide a comprehensive summary:"
-        )
-
-    structured_output = {
-        "query": instructions,
-        "source_url": url,
-        "collected_pages": len(processed_results),
-        "summary": final_result.get('summary', ""),
-        "key_points": final_result.get('key_points', []),
-        "details": [
-            {
-                "url": result.get("source_url", ""),
-                "score": result.get("relevance_score", 0),
-                "content_summary": result.get("summary", ""),
-                "key_points": result.get("key_points", [])
-            } for result in processed_results
-        ]
-    }
+    semaphore = asyncio.Semaphore(8)
+
+    async def process_page(page):
+        async with semaphore:
+            print(f"Processing page: {page['url']} (score: {page['relevance_score']})")
+            return await client.ai_processor.process_content(page, instructions)
+
+    tasks = [asyncio.ensure_future(process_page(page)) for page in collected_pages]
+
+    def dump(value):
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ")
 
     output_file = "scraping_results.json"
-    with open(output_file, "w", encoding="utf-8") as json_file:
-        json.dump(structured_output, json_file, indent=4, ensure_ascii=False)
+    combined_content = io.StringIO()
+    with open(output_file, "wb") as json_file:
+        json_file.write(b"{\n  \"query\": " + dump(instructions))
+        json_file.write(b",\n  \"source_url\": " + dump(url))
+        json_file.write(b",\n  \"collected_pages\": " + dump(len(collected_pages)))
+        json_file.write(b",\n  \"details\": [")
+
+        # Awaiting in order keeps the details sorted by score while the
+        # remaining pages are still being processed in the background.
+        for i, (page, task) in enumerate(zip(collected_pages, tasks)):
+            try:
+                processed = await task
+            except Exception as e:
+                processed = {"summary": f"Error processing content: {e}", "key_points": []}
+
+            summary = processed.get("summary", "")
+            if i:
+                combined_content.write("\n\n")
+            combined_content.write(f"--- From {page['url']} (Score: {page['relevance_score']}) ---\n{summary}")
+
+            detail = {
+                "url": page["url"],
+                "score": page["relevance_score"],
+                "content_summary": summary,
+                "key_points": processed.get("key_points", [])
+            }
+            json_file.write((b"\n    " if i == 0 else b",\n    ") + dump(detail).replace(b"\n", b"\n  "))
+
+        json_file.write(b"\n  ]")
+
+        if len(collected_pages) == 1:
+            final_result = {"summary": summary, "key_points": processed.get("key_points", [])}
+        else:
+            print("Generating final AI summary from all collected pages...")
+
+            combined_data = {"content": combined_content.getvalue()}
+
+            final_result = await client.ai_processor.process_content(
+                combined_data,
+                f"Provide a comprehensive summary about {instructions}, based on the following information from multiple pages"
+            )
+
+        json_file.write(b",\n  \"summary\": " + dump(final_result.get('summary', "")))
+        json_file.write(b",\n  \"key_points\": " + dump(final_result.get('key_points', [])))
+        json_file.write(b"\n}\n")
     
     print(f"\nResults saved to '{output_file}'.")
 
-    print(json.dumps(structured_output, indent=4, ensure_ascii=False))
+    sys.stdout.flush()
+    with open(output_file, "rb") as json_file:
+        shutil.copyfileobj(json_file, sys.stdout.buffer)
+
+async def run_example():
+    async with openai_session():
+        await main()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run_example())
@@ -1,5 +1,11 @@
+"""
+Rufus Web Crawler - An intelligent web scraper with AI content analysis
+"""
+
 from .client import RufusClient
 from .scraper import WebScraper
-from .ai_processor import AIContentProcessor
+from .ai_processor import AIContentProcessor, SemanticCache
+from .llm_cache import LLMCache
 
-__all__ = ['RufusClient', 'WebScraper', 'AIContentProcessor']
+__version__ = "0.1.0"
+__all__ = ['RufusClient', 'WebScraper', 'AIContentProcessor', 'SemanticCache', 'LLMCache']
@@ -1,13 +1,27 @@
+import asyncio
+import functools
 import json
 import os
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import math
+import operator
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import AsyncIterator, FrozenSet, List, Dict, Any, Optional, Tuple
+import aiohttp
 import openai
 import nltk
+import tiktoken
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from nltk.stem import PorterStemmer
 import re
+from .llm_cache import LLMCache, cached_chat
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,32 +29,113 @@ logging.basicConfig(
 )
 logger = logging.getLogger('rufus')
 
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except Exception as e:
-    logger.warning(f"Failed to download NLTK data: {e}. Using fallback methods.")
+_TOKEN_RE = re.compile(r"[^\W\d_]+|\S")
+_TOPIC_RE = re.compile(r'(?:details|information|info)\s+(?:of|about|on)\s+(\w+)')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\n')
+# Groups: the whole bullet line, and its text after the marker
+_BULLET_RE = re.compile(r'^[^\S\n]*((?:[•*-]+|\d+\.)[^\S\n]*([^\n]*?))[^\S\n]*$', re.M)
+
+@functools.lru_cache(maxsize=1)
+def _get_stopwords() -> Optional[FrozenSet[str]]:
+    """English stopwords, downloading the NLTK corpus on first use if needed. None if unavailable"""
+    try:
+        return frozenset(stopwords.words('english'))
+    except LookupError:
+        pass
+
+    try:
+        nltk.download('stopwords', quiet=True)
+        return frozenset(stopwords.words('english'))
+    except Exception as e:
+        logger.warning(f"Failed to load NLTK stopwords: {e}. Using fallback methods.")
+        return None
+
+@functools.lru_cache(maxsize=1)
+def _get_stemmer() -> PorterStemmer:
+    return PorterStemmer()
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding() -> Optional["tiktoken.Encoding"]:
+    """tiktoken encoding used by GPT-4, or None if it cannot be loaded"""
+    try:
+        return tiktoken.encoding_for_model("gpt-4")
+    except Exception as e:
+        logger.warning(f"Failed to load tiktoken encoding: {e}. Estimating token counts from text length.")
+        return None
+
+async def _load_encoding() -> None:
+    """Load the tiktoken encoding on a worker thread; its first use downloads the BPE file with blocking I/O"""
+    if _get_encoding.cache_info().currsize == 0:
+        await asyncio.get_running_loop().run_in_executor(None, _get_encoding)
+
+_SUMMARY_SYSTEM_PROMPT = (
+    "You are a helpful assistant that summarizes web content accurately and concisely, "
+    "extracting the most relevant information based on the user's instructions.\n\n"
+    "Each request contains a TASK describing what the user wants to know and the CONTENT "
+    "of a web page, optionally followed by the SOURCE URL and the PART of the page being "
+    "shown when it was split into several parts.\n"
+    "- Only use information present in the CONTENT; do not invent details.\n"
+    "- Focus on what the TASK asks for and skip navigation text, legal notices and ads.\n"
+    "- Present the important facts as a bulleted list using '-' bullets, one fact per line.\n"
+    "- Keep names, prices, dates and other specifics exactly as written.\n"
+    "- If the CONTENT has nothing relevant to the TASK, say so in one sentence."
+)
+
+def _count_tokens(text: str) -> int:
+    """Number of GPT-4 tokens in text, estimated at ~4 characters per token without tiktoken"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+@asynccontextmanager
+async def openai_session(max_connections: int = 64) -> AsyncIterator[aiohttp.ClientSession]:
+    """Route every OpenAI request made inside the block through one pooled HTTP session"""
+    current = openai.aiosession.get()
+    if current is not None:
+        yield current
+        return
+
+    connector = aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        token = openai.aiosession.set(session)
+        try:
+            yield session
+        finally:
+            openai.aiosession.reset(token)
 
 class AIKeywordExtractor:
     """Uses AI models to extract relevant keywords from user instructions"""
+
+    max_cached_instructions = 1024
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the keyword extractor with an optional API key"""
+    def __init__(self, api_key: Optional[str] = None, llm_cache: Optional[LLMCache] = None):
+        """Initialize the keyword extractor with an optional API key and response cache"""
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.llm_cache = llm_cache
+        self._kw_cache: "OrderedDict[str, List[str]]" = OrderedDict()
         if not self.api_key:
             logger.warning("No OpenAI API key provided. Advanced keyword extraction will be limited.")
     
     async def extract_keywords(self, instructions: str) -> List[str]:
         """Extract keywords using GPT model for more intelligent analysis"""
+        if instructions in self._kw_cache:
+            self._kw_cache.move_to_end(instructions)
+            return list(self._kw_cache[instructions])
+
+        # Load the NLTK resources for the fallback path on a worker thread, overlapping
+        # the first-use download with the GPT request instead of blocking the event loop
+        fallback_ready = asyncio.get_running_loop().run_in_executor(None, _get_stopwords)
+
         if not self.api_key:
             logger.warning("No API key available for GPT keyword extraction. Using fallback method.")
-            return self._fallback_keyword_extraction(instructions)
+            await fallback_ready
+            return self._remember_keywords(instructions, self._fallback_keyword_extraction(instructions))
             
         try:
-            
-            openai.api_key = self.api_key
-            
-            response = openai.ChatCompletion.create(
+            response_text = await cached_chat(
+                self.llm_cache,
+                api_key=self.api_key,
                 model="gpt-4", 
                 messages=[
                     {"role": "system", "content": "You are a keyword extraction specialist. Extract the most relevant search keywords from the given instructions. Focus on terms that would be useful for web crawling and content relevance matching. Return only a JSON array of the keywords, nothing else."},
@@ -51,79 +146,338 @@ class AIKeywordExtractor:
                 response_format={"type": "json_object"}
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(response_text)
             keywords = result.get("keywords", [])
             
             if not keywords:
                 logger.warning("GPT returned no keywords. Using fallback method.")
-                return self._fallback_keyword_extraction(instructions)
+                await fallback_ready
+                return self._remember_keywords(instructions, self._fallback_keyword_extraction(instructions))
                 
             logger.info(f"GPT extracted keywords: {keywords}")
-            return keywords
+            return self._remember_keywords(instructions, keywords)
             
         except Exception as e:
             logger.error(f"GPT keyword extraction failed: {e}")
+            await fallback_ready
             return self._fallback_keyword_extraction(instructions)
+
+    def _remember_keywords(self, instructions: str, keywords: List[str]) -> List[str]:
+        """Cache the keywords for these instructions, evicting the least recently used entry"""
+        self._kw_cache[instructions] = list(keywords)
+        if len(self._kw_cache) > self.max_cached_instructions:
+            self._kw_cache.popitem(last=False)
+        return keywords
     
     def _fallback_keyword_extraction(self, instructions: str) -> List[str]:
         """Fallback method using NLTK for keyword extraction"""
+        stop_words = _get_stopwords()
+        if stop_words is None:
+            return self._simple_keyword_extraction(instructions)
+        stemmer = _get_stemmer()
+
         try:
-            stop_words = set(stopwords.words('english'))
-            words = word_tokenize(instructions.lower())
+            lowered = instructions.lower()
 
             phrases = []
+            stems = []
             current_phrase = []
-            
-            for word in words:
-                if word.lower() not in stop_words and word.isalpha():
+
+            for word in _TOKEN_RE.findall(lowered):
+                if word.isalpha() and word not in stop_words:
                     current_phrase.append(word)
+                    stems.append(stemmer.stem(word))
                 elif current_phrase:
-                    if len(current_phrase) > 1:
-                        phrases.append(" ".join(current_phrase))
-                    else:
-                        phrases.append(current_phrase[0])
-                    current_phrase = []
-            
-            if current_phrase:
-                if len(current_phrase) > 1:
                     phrases.append(" ".join(current_phrase))
-                else:
-                    phrases.append(current_phrase[0])
+                    current_phrase = []
 
-            stemmer = PorterStemmer()
-            individual_keywords = [stemmer.stem(word.lower()) for word in words 
-                                  if word.lower() not in stop_words and word.isalpha()]
+            if current_phrase:
+                phrases.append(" ".join(current_phrase))
 
-            all_keywords = phrases + individual_keywords
+            all_keywords = phrases + stems
 
-            query_topic = re.search(r'(?:details|information|info)\s+(?:of|about|on)\s+(\w+)', instructions.lower())
-            if query_topic and query_topic.group(1) not in all_keywords:
+            query_topic = _TOPIC_RE.search(lowered)
+            if query_topic:
                 all_keywords.append(query_topic.group(1))
 
-            seen = set()
-            keywords = [x for x in all_keywords if not (x in seen or seen.add(x))]
+            keywords = list(dict.fromkeys(all_keywords))
             
             logger.info(f"Fallback extracted keywords: {keywords}")
             return keywords
             
         except Exception as e:
             logger.error(f"Fallback keyword extraction failed: {e}")
-            words = instructions.lower().split()
-            keywords = [word for word in words if len(word) > 3]
-            logger.info(f"Simple extracted keywords: {keywords}")
-            return keywords
+            return self._simple_keyword_extraction(instructions)
+
+    def _simple_keyword_extraction(self, instructions: str) -> List[str]:
+        """Last-resort keyword extraction that keeps every longer word"""
+        words = instructions.lower().split()
+        keywords = [word for word in words if len(word) > 3]
+        logger.info(f"Simple extracted keywords: {keywords}")
+        return keywords
+
+
+def _split_span(content: str, start: int, end: int, max_tokens: int) -> List[Tuple[int, int, int]]:
+    """
+    (start, end, tokens) pieces of content[start:end] that each fit in max_tokens, splitting at
+    the line break nearest the middle, else the nearest space, else the middle itself
+    """
+    tokens = _count_tokens(content[start:end])
+    if tokens <= max_tokens or end - start < 2:
+        return [(start, end, tokens)]
+
+    middle = (start + end) // 2
+    for separator in ('\n', ' '):
+        before = content.rfind(separator, start + 1, middle + 1)
+        after = content.find(separator, middle, end - 1)
+        candidates = [position for position in (before, after) if position != -1]
+        if candidates:
+            split = min(candidates, key=lambda position: abs(position - middle))
+            return _split_span(content, start, split, max_tokens) + _split_span(content, split + 1, end, max_tokens)
+
+    return _split_span(content, start, middle, max_tokens) + _split_span(content, middle, end, max_tokens)
+
+# Chunk offsets of recently seen pages, keyed by (content digest, max_tokens) so the
+# cache does not keep whole pages alive
+_CHUNK_OFFSETS_CACHE: "OrderedDict[Tuple[bytes, int], Tuple[Tuple[int, int], ...]]" = OrderedDict()
+_MAX_CACHED_CHUNK_OFFSETS = 128
+
+def _chunk_offsets(content: str, max_tokens: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    (start, end) offsets of the chunks of content, packing whole paragraphs up to max_tokens.
+    Paragraphs over the budget are split at line breaks, then at spaces, so no chunk exceeds it.
+    Cached because the same page is chunked again by embedding prefetch and by repeated
+    process_content calls, and tokenizing every paragraph dominates the cost.
+    """
+    key = (hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest(), max_tokens)
+    if key in _CHUNK_OFFSETS_CACHE:
+        _CHUNK_OFFSETS_CACHE.move_to_end(key)
+        return _CHUNK_OFFSETS_CACHE[key]
+
+    offsets = _compute_chunk_offsets(content, max_tokens)
+    _CHUNK_OFFSETS_CACHE[key] = offsets
+    if len(_CHUNK_OFFSETS_CACHE) > _MAX_CACHED_CHUNK_OFFSETS:
+        _CHUNK_OFFSETS_CACHE.popitem(last=False)
+    return offsets
+
+def _compute_chunk_offsets(content: str, max_tokens: int) -> Tuple[Tuple[int, int], ...]:
+    """Uncached _chunk_offsets"""
+    spans = []
+    para_start = 0
+    for match in _PARAGRAPH_BREAK_RE.finditer(content):
+        spans.extend(_split_span(content, para_start, match.start(), max_tokens))
+        para_start = match.end()
+    spans.extend(_split_span(content, para_start, len(content), max_tokens))
+
+    # The text joining two pieces (a blank line, a line break or a space) has tokens of
+    # its own; short paragraphs would overrun the budget noticeably if it went uncounted
+    gap_tokens = {}
+    def joining_tokens(prev_end: int, start: int) -> int:
+        gap = content[prev_end:start]
+        if gap not in gap_tokens:
+            gap_tokens[gap] = _count_tokens(gap) if gap else 0
+        return gap_tokens[gap]
+
+    total = sum(tokens for _, _, tokens in spans)
+    total += sum(joining_tokens(prev[1], span[0]) for prev, span in zip(spans, spans[1:]))
+    if total <= max_tokens:
+        return ((0, len(content)),)
+
+    offsets = []
+    chunk_tokens = []
+    chunk_start = 0
+    chunk_end = None
+    current_length = 0
+
+    for start, end, para_length in spans:
+        if chunk_end is not None:
+            separator_tokens = joining_tokens(chunk_end, start)
+            if current_length + separator_tokens + para_length > max_tokens:
+                offsets.append((chunk_start, chunk_end))
+                chunk_tokens.append(current_length)
+                chunk_start = start
+                current_length = 0
+            else:
+                current_length += separator_tokens
+        chunk_end = end
+        current_length += para_length
+
+    offsets.append((chunk_start, chunk_end))
+    chunk_tokens.append(current_length)
+
+    logger.debug(f"Split content into {len(offsets)} chunks with token counts {chunk_tokens}")
+    return tuple(offsets)
+
+
+class SemanticCache:
+    """Embedding-keyed cache that reuses AI responses for near-duplicate prompts"""
+
+    def __init__(self, threshold: float = 0.92, ttl: int = 7 * 24 * 3600,
+                 quality_rate: Optional[float] = None, cache_dir: Optional[str] = None,
+                 embedding_model: str = "text-embedding-3-small", max_entries: int = 500):
+        """
+        Initialize the semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cached response to be reused
+            ttl: Seconds before a cached response expires
+            quality_rate: Target share of cache hits judged acceptable via record_feedback.
+                          When set, the threshold is nudged up or down to track it
+            cache_dir: Directory used to persist the cache between runs (in-memory if None)
+            embedding_model: OpenAI embedding model used to embed prompts
+            max_entries: Most entries kept per namespace; the oldest are evicted first.
+                         Every lookup compares against all of them
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.quality_rate = quality_rate
+        self.cache_dir = cache_dir
+        self.embedding_model = embedding_model
+        self.max_entries = max_entries
+        self._observed_quality = quality_rate
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._conn = None
+        self._db_lock = threading.Lock()
+
+    def namespace(self, model: str, temperature: float) -> str:
+        """Key for the set of entries that share a model, sampling temperature, embedding model and system prompt"""
+        prompt_hash = hashlib.sha256(_SUMMARY_SYSTEM_PROMPT.encode("utf-8")).hexdigest()
+        key = f"{model}:{temperature}:{self.embedding_model}:{prompt_hash}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[str]:
+        """Return the cached response most similar to the embedding, if close enough"""
+        entries = self._load(namespace)
+        now = time.time()
+        vector = self._normalize(embedding)
+
+        best_score, best_entry = -1.0, None
+        for entry in entries:
+            # Vectors of another length come from a different embedding model and cannot be compared
+            if entry["expires_at"] < now or len(entry["embedding"]) != len(vector):
+                continue
+            score = sum(map(operator.mul, vector, entry["embedding"]))
+            if score > best_score:
+                best_score, best_entry = score, entry
+
+        if best_entry is not None and best_score > self.threshold:
+            logger.info(f"Semantic cache hit (similarity: {best_score:.3f})")
+            return best_entry["response"]
+        return None
+
+    def add(self, namespace: str, embedding: List[float], prompt: str, response: str):
+        """Store a response under the embedding of the prompt that produced it"""
+        self._persist(namespace, self._remember(namespace, embedding, prompt, response))
+
+    async def add_async(self, namespace: str, embedding: List[float], prompt: str, response: str):
+        """add, with the disk write run on the default executor instead of the event loop"""
+        entry = self._remember(namespace, embedding, prompt, response)
+        if self.cache_dir:
+            await asyncio.get_running_loop().run_in_executor(None, self._persist, namespace, entry)
+
+    def record_feedback(self, hit_was_acceptable: bool, step: float = 0.005):
+        """Adjust the similarity threshold towards the configured quality_rate"""
+        if self.quality_rate is None:
+            return
+        self._observed_quality = 0.9 * self._observed_quality + 0.1 * (1.0 if hit_was_acceptable else 0.0)
+        if self._observed_quality < self.quality_rate:
+            self.threshold = min(0.99, self.threshold + step)
+        else:
+            self.threshold = max(0.80, self.threshold - step)
+
+    def _normalize(self, embedding: List[float]) -> List[float]:
+        """Scale the embedding to unit length so a dot product gives cosine similarity"""
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if not norm:
+            return list(embedding)
+        return [x / norm for x in embedding]
+
+    def _remember(self, namespace: str, embedding: List[float], prompt: str, response: str) -> Dict[str, Any]:
+        """Add the entry in memory, dropping expired entries and the oldest beyond max_entries"""
+        entries = self._load(namespace)
+        now = time.time()
+        entry = {
+            "embedding": self._normalize(embedding),
+            "prompt_hash": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "response": response,
+            "expires_at": now + self.ttl
+        }
+        # Rebind rather than mutate so a lookup iterating the old list is unaffected
+        kept = [existing for existing in entries if existing["expires_at"] >= now]
+        kept.append(entry)
+        self._entries[namespace] = kept[-self.max_entries:]
+        return entry
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Writes happen on executor threads; _db_lock serializes every use of the connection
+            self._conn = sqlite3.connect(os.path.join(self.cache_dir, "semantic.db"), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (namespace TEXT NOT NULL, embedding BLOB NOT NULL,"
+                " prompt_hash TEXT NOT NULL, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace, expires_at)")
+        return self._conn
+
+    def _load(self, namespace: str) -> List[Dict[str, Any]]:
+        if namespace not in self._entries:
+            entries = []
+            if self.cache_dir:
+                try:
+                    with self._db_lock:
+                        rows = self._connect().execute(
+                            "SELECT embedding, prompt_hash, response, expires_at FROM entries"
+                            " WHERE namespace = ? AND expires_at >= ? ORDER BY rowid DESC LIMIT ?",
+                            (namespace, time.time(), self.max_entries)
+                        ).fetchall()
+                    entries = [{
+                        "embedding": array("d", embedding).tolist(),
+                        "prompt_hash": prompt_hash,
+                        "response": response,
+                        "expires_at": expires_at
+                    } for embedding, prompt_hash, response, expires_at in reversed(rows)]
+                except Exception as e:
+                    logger.warning(f"Failed to load semantic cache from {self.cache_dir}: {e}")
+            self._entries[namespace] = entries
+        return self._entries[namespace]
+
+    def _persist(self, namespace: str, entry: Dict[str, Any]):
+        """Append the entry to the database and trim the namespace to max_entries"""
+        if not self.cache_dir:
+            return
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT INTO entries (namespace, embedding, prompt_hash, response, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (namespace, array("d", entry["embedding"]).tobytes(), entry["prompt_hash"],
+                     entry["response"], entry["expires_at"])
+                )
+                conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND (expires_at < ? OR rowid NOT IN"
+                    " (SELECT rowid FROM entries WHERE namespace = ? ORDER BY rowid DESC LIMIT ?))",
+                    (namespace, time.time(), namespace, self.max_entries)
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to save semantic cache to {self.cache_dir}: {e}")
 
 
 class AIContentProcessor:
     """Process web content using AI models to generate summaries and insights"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize with an OpenAI API key"""
+    def __init__(self, api_key: Optional[str] = None, semantic_cache: Optional[SemanticCache] = None,
+                 llm_cache: Optional[LLMCache] = None, max_concurrent_requests: int = 8):
+        """Initialize with an OpenAI API key, optional response caches and a cap on in-flight AI requests"""
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        self.semantic_cache = semantic_cache
+        self.llm_cache = llm_cache
+        self.max_concurrent_requests = max_concurrent_requests
+        self._semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self._embeddings: Dict[str, List[float]] = {}
         if not self.api_key:
             logger.warning("No OpenAI API key provided for content processing.")
-        else:
-            openai.api_key = self.api_key
         
     async def process_content(self, content_data: Dict, instructions: str) -> Dict:
         """Process website content with AI model based on instructions"""
@@ -139,32 +493,20 @@ class AIContentProcessor:
             
         try:
             content = content_data["content"]
+            await _load_encoding()
             chunks = self._chunk_content(content)
             
-            results = []
-            
-            for i, chunk in enumerate(chunks):
-                chunk_prompt = instructions
-                if len(chunks) > 1:
-                    chunk_prompt = f"{instructions} (Content part {i+1}/{len(chunks)})"
-                
-                try:
-                    response = openai.ChatCompletion.create(
-                        model="gpt-4",
-                        messages=[
-                            {"role": "system", "content": "You are a helpful assistant that summarizes web content accurately and concisely, extracting the most relevant information based on the user's instructions."},
-                            {"role": "user", "content": f"{chunk_prompt}\n\n{chunk}"}
-                        ],
-                        max_tokens=800,
-                        temperature=0.3
-                    )
-                    
-                    text = response.choices[0].message.content.strip()
-                    results.append(text)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing content chunk {i+1}: {e}")
-                    results.append(f"Error processing content: {str(e)}")
+            outcomes = await asyncio.gather(
+                *[
+                    self._process_chunk(instructions, chunk, i, len(chunks), content_data.get('url'))
+                    for i, chunk in enumerate(chunks)
+                ],
+                return_exceptions=True
+            )
+            results = [
+                f"Error processing content: {str(outcome)}" if isinstance(outcome, Exception) else outcome
+                for outcome in outcomes
+            ]
             
             combined_result = "\n\n".join(results)
             
@@ -181,46 +523,146 @@ class AIContentProcessor:
             logger.error(f"Failed to process content: {e}")
             return {"error": f"Failed to process content: {str(e)}"}
             
-    def _chunk_content(self, content: str, max_length: int = 4000) -> List[str]:
-        """Split content into manageable chunks for the AI model"""
-        if len(content) <= max_length:
-            return [content]
+    async def prefetch_embeddings(self, jobs: List[Tuple[Dict, str]], batch_size: int = 2048,
+                                  max_batch_tokens: int = 250000):
+        """
+        Embed the chunk prompts of several process_content calls in as few requests as possible
 
-        paragraphs = content.split('\n\n')
-        
-        chunks = []
-        current_chunk = []
-        current_length = 0
+        Args:
+            jobs: (content_data, instructions) pairs that will later be passed to process_content
+            batch_size: Maximum number of prompts per embedding request
+            max_batch_tokens: Maximum estimated tokens per embedding request
+        """
+        # Chunking counts tokens, so load the encoding before the callers fan out
+        await _load_encoding()
+        if not self.semantic_cache or not self.api_key:
+            return
+
+        prompts = []
+        for content_data, instructions in jobs:
+            if not content_data or "content" not in content_data:
+                continue
+            chunks = self._chunk_content(content_data["content"])
+            for i, chunk in enumerate(chunks):
+                request = self._build_request(instructions, chunk, i, len(chunks), content_data.get('url'))
+                prompt = request["messages"][-1]["content"]
+                if prompt not in self._embeddings:
+                    prompts.append(prompt)
+        prompts = list(dict.fromkeys(prompts))
+
+        batch, batch_tokens = [], 0
+        for prompt in prompts:
+            prompt_tokens = _count_tokens(prompt)
+            if batch and (len(batch) >= batch_size or batch_tokens + prompt_tokens > max_batch_tokens):
+                await self._embed_batch(batch)
+                batch, batch_tokens = [], 0
+            batch.append(prompt)
+            batch_tokens += prompt_tokens
+        if batch:
+            await self._embed_batch(batch)
+
+    async def _embed_batch(self, prompts: List[str]):
+        """Embed a batch of prompts and remember the vectors for _semantic_lookup"""
+        try:
+            response = await openai.Embedding.acreate(
+                api_key=self.api_key,
+                input=prompts,
+                model=self.semantic_cache.embedding_model
+            )
+        except Exception as e:
+            logger.warning(f"Failed to embed {len(prompts)} prompts for semantic cache: {e}")
+            return
+
+        for item in response["data"]:
+            self._embeddings[prompts[item["index"]]] = item["embedding"]
+        logger.info(f"Prefetched {len(prompts)} prompt embeddings in one request")
+
+    def _build_request(self, instructions: str, chunk: str, index: int, total: int,
+                       source_url: Optional[str] = None) -> Dict:
+        """
+        Chat completion request that summarizes one content chunk.
+        The stable system prompt and task come first and the per-chunk details last,
+        so consecutive requests share the longest possible prompt prefix.
+        """
+        user_message = f"TASK:\n{instructions}\n\nCONTENT:\n{chunk}"
+        if source_url:
+            user_message += f"\n\nSOURCE: {source_url}"
+        if total > 1:
+            user_message += f"\n\nPART: {index+1}/{total}"
+
+        return {
+            "model": "gpt-4",
+            "messages": [
+                {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": user_message}
+            ],
+            "max_tokens": 800,
+            "temperature": 0.3
+        }
+
+    def _request_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight AI requests, rebuilt for each event loop the processor runs on"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self.max_concurrent_requests))
+        return self._semaphore[1]
+
+    async def _process_chunk(self, instructions: str, chunk: str, index: int, total: int,
+                             source_url: Optional[str] = None) -> str:
+        """Summarize a single content chunk, returning an error message if the request fails"""
+        async with self._request_semaphore():
+            try:
+                request = self._build_request(instructions, chunk, index, total, source_url)
+
+                cached_text, embedding = await self._semantic_lookup(request)
+                if cached_text is not None:
+                    return cached_text
+
+                response_text = await cached_chat(self.llm_cache, api_key=self.api_key, **request)
+                text = response_text.strip()
+
+                if embedding is not None:
+                    namespace = self.semantic_cache.namespace(request["model"], request["temperature"])
+                    await self.semantic_cache.add_async(namespace, embedding, request["messages"][-1]["content"], text)
+
+                return text
+
+            except Exception as e:
+                logger.error(f"Error processing content chunk {index+1}: {e}")
+                return f"Error processing content: {str(e)}"
+
+    async def _semantic_lookup(self, request: Dict) -> Tuple[Optional[str], Optional[List[float]]]:
+        """Return a cached response for the request, along with the prompt embedding"""
+        if not self.semantic_cache:
+            return None, None
+
+        prompt = request["messages"][-1]["content"]
+        embedding = self._embeddings.pop(prompt, None)
+        if embedding is None:
+            try:
+                response = await openai.Embedding.acreate(
+                    api_key=self.api_key,
+                    input=prompt,
+                    model=self.semantic_cache.embedding_model
+                )
+                embedding = response["data"][0]["embedding"]
+            except Exception as e:
+                logger.warning(f"Failed to embed prompt for semantic cache: {e}")
+                return None, None
+
+        namespace = self.semantic_cache.namespace(request["model"], request["temperature"])
+        return self.semantic_cache.lookup(namespace, embedding), embedding
         
-        for para in paragraphs:
-            para_length = len(para)
-            
-            if current_length + para_length > max_length and current_chunk:
-                chunks.append('\n\n'.join(current_chunk))
-                current_chunk = [para]
-                current_length = para_length
-            else:
-                current_chunk.append(para)
-                current_length += para_length
-                
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
-            
-        return chunks
+    def _chunk_content(self, content: str, max_tokens: int = 6000) -> List[str]:
+        """Split content into chunks of at most max_tokens model tokens"""
+        return [content[start:end] for start, end in _chunk_offsets(content, max_tokens)]
         
     def _extract_key_points(self, text: str) -> List[str]:
         """Extract key points from the AI-generated summary"""
-        points = []
-
-        lines = text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.startswith(('•', '-', '*', '1.', '2.', '3.')) and len(line) > 5:
-                point = line.lstrip('•-*123456789. ')
-                points.append(point)
+        points = [point for line, point in _BULLET_RE.findall(text) if point and len(line) > 5]
 
         if not points:
             sentences = text.split('. ')
-            points = [s.strip() + '.' for s in sentences if len(s) > 20 and len(s) < 200][:5]
+            points = list(islice((s.strip() + '.' for s in sentences if len(s) > 20 and len(s) < 200), 5))
             
-        return points[:10]
\ No newline at end of file
+        return points[:10]
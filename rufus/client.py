@@ -1,13 +1,14 @@
-import json
 import logging
 import os
 import sys
 import asyncio
+import orjson
 from typing import List, Dict, Optional
 from playwright.async_api import async_playwright
-from .ai_processor import AIContentProcessor
-from .scraper import WebScraper
+from .ai_processor import AIContentProcessor, SemanticCache, openai_session
+from .scraper import WebScraper, USER_AGENT
 from .ai_processor import AIKeywordExtractor  
+from .llm_cache import LLMCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,24 +19,28 @@ logger = logging.getLogger('rufus')
 class RufusClient:
     """Main client for the Rufus web scraping and content analysis tool"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, semantic_cache: Optional[SemanticCache] = None,
+                 llm_cache: Optional[LLMCache] = None):
         """
         Initialize the Rufus client
         
         Args:
             api_key: OpenAI API key for content processing and advanced keyword extraction
                     If not provided, will look for OPENAI_API_KEY in environment variables
+            semantic_cache: Optional cache that reuses AI summaries for near-duplicate prompts
+            llm_cache: Optional on-disk cache that reuses responses for identical AI requests
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             logger.warning("No API key provided. Some features will be limited.")
             
-        self.keyword_extractor = AIKeywordExtractor(self.api_key)
-        self.ai_processor = AIContentProcessor(self.api_key)
+        self.keyword_extractor = AIKeywordExtractor(self.api_key, llm_cache)
+        self.ai_processor = AIContentProcessor(self.api_key, semantic_cache, llm_cache)
         self.scraper = None
         
     async def scrape_with_cumulative_score(self, url: str, instructions: str, max_depth: int = 2, 
-                                       min_score: int = 60, cumulative_score_threshold: int = 600) -> List[Dict]:
+                                       min_score: int = 60, cumulative_score_threshold: int = 600,
+                                       top_k: Optional[int] = None) -> List[Dict]:
         """
         Scrape website starting from url based on instructions.
         Collects pages with relevance score >= min_score
@@ -47,11 +52,13 @@ class RufusClient:
             max_depth: Maximum crawl depth (default: 2)
             min_score: Minimum relevance score for collecting pages (default: 60)
             cumulative_score_threshold: Cumulative score threshold to stop crawling (default: 600)
+            top_k: Keep only the top_k highest scoring pages (default: keep all)
             
         Returns:
             List of collected pages with scores >= min_score
         """
-        keywords = await self.keyword_extractor.extract_keywords(instructions)
+        async with openai_session():
+            keywords = await self.keyword_extractor.extract_keywords(instructions)
         logger.info(f"Extracted keywords: {keywords}")
 
         self.scraper = WebScraper(keywords)
@@ -63,7 +70,7 @@ class RufusClient:
                 )
                 context = await browser.new_context(
                     viewport={"width": 1280, "height": 800},
-                    user_agent="Rufus Web Scraper 1.0"
+                    user_agent=USER_AGENT
                 )
 
                 collected_pages = await self.scraper.crawl_with_score_criteria(
@@ -71,7 +78,8 @@ class RufusClient:
                     start_url=url,
                     max_depth=max_depth,
                     min_score=min_score,
-                    cumulative_score_threshold=cumulative_score_threshold
+                    cumulative_score_threshold=cumulative_score_threshold,
+                    top_k=top_k
                 )
                 
                 await browser.close()
@@ -88,7 +96,8 @@ class RufusClient:
             return []
     
     async def analyze(self, url: str, instructions: str, max_depth: int = 2, 
-                     min_score: int = 60, cumulative_score_threshold: int = 600) -> Dict:
+                     min_score: int = 60, cumulative_score_threshold: int = 600,
+                     max_concurrency: int = 8, top_k: Optional[int] = None) -> Dict:
         """
         Complete analysis pipeline: Scrape, process, and generate a comprehensive report
         
@@ -98,80 +107,102 @@ class RufusClient:
             max_depth: Maximum crawl depth (default: 2)
             min_score: Minimum relevance score for collecting pages (default: 60)
             cumulative_score_threshold: Cumulative score threshold to stop crawling (default: 600)
+            max_concurrency: Maximum number of pages processed by the AI model at once (default: 8)
+            top_k: Analyze only the top_k highest scoring pages (default: all collected pages)
             
         Returns:
             Comprehensive analysis results with summary and details
         """
         logger.info(f"Starting analysis of {url} with instructions: {instructions}")
-
-        collected_pages = await self.scrape_with_cumulative_score(
-            url=url,
-            instructions=instructions,
-            max_depth=max_depth,
-            min_score=min_score,
-            cumulative_score_threshold=cumulative_score_threshold
-        )
+        async with openai_session():
+            collected_pages = await self.scrape_with_cumulative_score(
+                url=url,
+                instructions=instructions,
+                max_depth=max_depth,
+                min_score=min_score,
+                cumulative_score_threshold=cumulative_score_threshold,
+                top_k=top_k
+            )
         
-        if not collected_pages:
-            logger.warning("No relevant pages found matching the criteria.")
-            return {
-                "query": instructions,
-                "source_url": url,
-                "collected_pages": 0,
-                "summary": "No relevant content found. Try different keywords or a different starting URL.",
-                "key_points": [],
-                "details": []
-            }
+            if not collected_pages:
+                logger.warning("No relevant pages found matching the criteria.")
+                return {
+                    "query": instructions,
+                    "source_url": url,
+                    "collected_pages": 0,
+                    "summary": "No relevant content found. Try different keywords or a different starting URL.",
+                    "key_points": [],
+                    "details": []
+                }
             
-        logger.info(f"Processing {len(collected_pages)} pages with AI analysis...")
+            logger.info(f"Processing {len(collected_pages)} pages with AI analysis...")
 
-        processed_results = []
-        for page in collected_pages:
-            logger.info(f"Processing page: {page['url']} (score: {page['relevance_score']})")
+            page_instructions = f"Provide a detailed summary about {instructions}"
 
-            focused_prompt = f"Based on the following content from {page['url']}, provide a detailed summary about {instructions}"
-            
-            processed = await self.ai_processor.process_content(page, focused_prompt)
-            processed['source_url'] = page['url']
-            processed['title'] = page.get('title', 'Untitled')
-            processed['relevance_score'] = page['relevance_score']
-            processed_results.append(processed)
-
-        final_result = {}
-        if processed_results:
-            logger.info("Generating final AI summary from all collected pages...")
-
-            combined_data = {
-                "content": "\n\n".join([
-                    f"--- From {result['title']} ({result['source_url']}) (Score: {result['relevance_score']}) ---\n{result['summary']}"
-                    for result in processed_results
-                ])
-            }
+            await self.ai_processor.prefetch_embeddings([(page, page_instructions) for page in collected_pages])
+
+            semaphore = asyncio.Semaphore(max_concurrency)
 
-            final_result = await self.ai_processor.process_content(
-                combined_data,
-                f"Based on the following information from multiple pages about {instructions}, provide a comprehensive analysis and summary:"
+            async def process_page(page: Dict) -> Dict:
+                async with semaphore:
+                    logger.info(f"Processing page: {page['url']} (score: {page['relevance_score']})")
+                    return await self.ai_processor.process_content(page, page_instructions)
+
+            outcomes = await asyncio.gather(
+                *[process_page(page) for page in collected_pages],
+                return_exceptions=True
             )
 
-        structured_output = {
-            "query": instructions,
-            "source_url": url,
-            "collected_pages": len(processed_results),
-            "summary": final_result.get('summary', ""),
-            "key_points": final_result.get('key_points', []),
-            "details": [
-                {
-                    "title": result.get("title", "Untitled"),
-                    "url": result.get("source_url", ""),
-                    "score": result.get("relevance_score", 0),
-                    "content_summary": result.get("summary", ""),
-                    "key_points": result.get("key_points", [])
-                } for result in processed_results
-            ]
-        }
+            processed_results = []
+            for page, processed in zip(collected_pages, outcomes):
+                if isinstance(processed, Exception):
+                    logger.error(f"Failed to process page {page['url']}: {processed}")
+                    processed = {"summary": f"Error processing content: {str(processed)}", "key_points": []}
+                processed['source_url'] = page['url']
+                processed['title'] = page.get('title', 'Untitled')
+                processed['relevance_score'] = page['relevance_score']
+                processed_results.append(processed)
+
+            final_result = {}
+            if len(processed_results) == 1:
+                final_result = {
+                    "summary": processed_results[0].get("summary", ""),
+                    "key_points": processed_results[0].get("key_points", [])
+                }
+            elif processed_results:
+                logger.info("Generating final AI summary from all collected pages...")
+
+                combined_data = {
+                    "content": "\n\n".join([
+                        f"--- From {result['title']} ({result['source_url']}) (Score: {result['relevance_score']}) ---\n{result.get('summary', '')}"
+                        for result in processed_results
+                    ])
+                }
+
+                final_result = await self.ai_processor.process_content(
+                    combined_data,
+                    f"Provide a comprehensive analysis and summary about {instructions}, based on the following information from multiple pages"
+                )
+
+            structured_output = {
+                "query": instructions,
+                "source_url": url,
+                "collected_pages": len(processed_results),
+                "summary": final_result.get('summary', ""),
+                "key_points": final_result.get('key_points', []),
+                "details": [
+                    {
+                        "title": result.get("title", "Untitled"),
+                        "url": result.get("source_url", ""),
+                        "score": result.get("relevance_score", 0),
+                        "content_summary": result.get("summary", ""),
+                        "key_points": result.get("key_points", [])
+                    } for result in processed_results
+                ]
+            }
         
-        logger.info("Analysis completed successfully")
-        return structured_output
+            logger.info("Analysis completed successfully")
+            return structured_output
 
 async def run_rufus(url, query, api_key=None):
     """Run Rufus analysis and return results"""
@@ -179,6 +210,20 @@ async def run_rufus(url, query, api_key=None):
     results = await client.analyze(url, query)
     return results
 
+async def _run_cli(url, query, api_key=None):
+    """CLI entry coroutine: start tasks eagerly (Python 3.12+) before running the analysis"""
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    return await run_rufus(url, query, api_key)
+
+def _run_event_loop(coro):
+    """Run coro on uvloop when it is installed, otherwise on the default asyncio loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
 def cli_main():
     """Command-line interface main function"""
     if len(sys.argv) < 3:
@@ -193,9 +238,10 @@ def cli_main():
         print("Warning: No OpenAI API key found. Set the OPENAI_API_KEY environment variable.")
         print("Some features may be limited.")
 
-    results = asyncio.run(run_rufus(url, query, api_key))
+    results = _run_event_loop(_run_cli(url, query, api_key))
     
-    print(json.dumps(results, indent=2))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(results, option=orjson.OPT_INDENT_2) + b"\n")
 
 if __name__ == "__main__":
     cli_main()
\ No newline at end of file
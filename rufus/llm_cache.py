@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+import openai
+
+logger = logging.getLogger('rufus')
+
+class LLMCache:
+    """On-disk exact-match cache of chat completion responses"""
+
+    def __init__(self, cache_dir: str = ".rufus_llm_cache"):
+        """Initialize the cache, stored as a SQLite database inside cache_dir"""
+        self.cache_dir = cache_dir
+        self._conn = None
+        self._db_lock = threading.Lock()
+
+    def key(self, request: Dict) -> str:
+        """SHA-256 of everything in the request that affects the completion"""
+        payload = {name: value for name, value in request.items() if name != "api_key"}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None on a miss"""
+        with self._db_lock:
+            row = self._connect().execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, response: str):
+        """Store the completion for key"""
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO completions (key, response) VALUES (?, ?)", (key, response))
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # get and set run on executor threads; _db_lock serializes every use of the connection
+            self._conn = sqlite3.connect(os.path.join(self.cache_dir, "completions.db"), check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+        return self._conn
+
+
+async def cached_chat(cache: Optional[LLMCache], **request) -> str:
+    """Run a chat completion, serving identical requests from the cache when one is given"""
+    key = None
+    if cache is not None:
+        try:
+            key = cache.key(request)
+            hit = await asyncio.get_running_loop().run_in_executor(None, cache.get, key)
+            if hit is not None:
+                logger.info("LLM cache hit")
+                return hit
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            key = None
+
+    response = await openai.ChatCompletion.acreate(**request)
+    text = response.choices[0].message.content
+
+    if key is not None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, cache.set, key, text)
+        except Exception as e:
+            logger.warning(f"Failed to store LLM cache entry: {e}")
+
+    return text
@@ -1,8 +1,25 @@
+import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
 import logging
-from typing import List, Dict, Any
-from playwright.async_api import BrowserContext, Page
-from urllib.parse import urlparse
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.robotparser import RobotFileParser
+import aiohttp
+from playwright.async_api import BrowserContext, Page, Route
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 import re
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -10,20 +27,237 @@ logging.basicConfig(
 )
 logger = logging.getLogger('rufus')
 
+USER_AGENT = "Rufus Web Scraper 1.0"
+
+# Only the page text is scored, so these are never worth downloading. Stylesheets are
+# kept because innerText depends on the CSS that hides menus and other chrome.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_AD_HOST_RE = re.compile(
+    r'(?:^|\.)(?:doubleclick\.net|googlesyndication\.com|googleadservices\.com|google-analytics\.com'
+    r'|googletagmanager\.com|adservice\.google\.com|amazon-adsystem\.com|adnxs\.com'
+    r'|facebook\.net|scorecardresearch\.com|taboola\.com|outbrain\.com|hotjar\.com)$'
+)
+
+# Runs in the page: checks the body, hides navigation chrome, picks the main content
+# and collects links, so each page costs a single evaluate round trip.
+_EXTRACT_PAGE_JS = """
+({ includeLinks, contentSelectors }) => {
+    const body = document.body;
+    if (!body) {
+        return { hasBody: false, shortBodyText: null, title: document.title, content: "", contentSelector: null, links: [] };
+    }
+
+    const bodyText = body.innerText;
+    const shortBodyText = bodyText && bodyText.length < 100 ? bodyText : null;
+
+    // Hide common non-content elements with one stylesheet rule instead of a style write per element
+    const hideChrome = document.createElement('style');
+    hideChrome.textContent = 'nav, footer, header, .menu, #menu, .navigation, .sidebar, #sidebar, .ads, .advertisement'
+        + ' { display: none !important; }';
+    (document.head || document.documentElement).appendChild(hideChrome);
+
+    const collectTexts = (selector, minLength) => Array.from(document.querySelectorAll(selector))
+        .map(el => el.innerText)
+        .filter(text => text && text.length > minLength);
+
+    let content = "";
+    let contentSelector = null;
+    for (const selector of contentSelectors) {
+        const texts = collectTexts(selector, 100);
+        if (texts.length) {
+            content = texts.join('\\n\\n');
+            contentSelector = selector;
+            break;
+        }
+    }
+    if (!content) {
+        const texts = collectTexts('p', 20);
+        content = texts.length ? texts.join('\\n\\n') : body.innerText;
+    }
+
+    const links = [];
+    if (includeLinks) {
+        for (const a of document.querySelectorAll('a[href]')) {
+            const href = a.getAttribute('href');
+            if (!href || /^(javascript:|mailto:|tel:|#)/i.test(href)) continue;
+            links.push([a.href, a.innerText || '']);
+        }
+    }
+
+    return { hasBody: true, shortBodyText, title: document.title, content, contentSelector, links };
+}
+"""
+
+@functools.lru_cache(maxsize=8192)
+def _join_url(base: str, url: str) -> str:
+    """urljoin, memoized because pages on a site keep linking to the same hrefs"""
+    return urljoin(base, url)
+
+@functools.lru_cache(maxsize=8192)
+def _canonical_url(url: str) -> str:
+    """WebScraper._canonicalize, memoized because every link is checked against the visited set more than once"""
+    if not url:
+        return ""
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    if ':' in host:
+        host = f"[{host}]"
+    if port is not None and (scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+    userinfo = parts.netloc.rpartition('@')[0]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+
+    # Sorting the raw parameters is enough for a dedupe key; nothing here is sent to the server
+    query = "&".join(sorted(param for param in parts.query.split('&') if param))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+def _count_short_lines(text: str, keyword: str, max_length: int = 100) -> int:
+    """Count the lines shorter than max_length that contain keyword, jumping between occurrences with str.find"""
+    count = 0
+    pos = text.find(keyword)
+    while pos != -1:
+        start = text.rfind('\n', 0, pos) + 1
+        end = text.find('\n', pos)
+        if end == -1:
+            end = len(text)
+        if end - start < max_length:
+            count += 1
+        pos = text.find(keyword, end + 1)
+    return count
+
+@functools.lru_cache(maxsize=32)
+def _keyword_matchers(keywords: Tuple[str, ...], aho_corasick_min_keywords: int):
+    """
+    Lowercased keywords, their whole-word patterns and, for long keyword lists when
+    pyahocorasick is installed, an automaton over the distinct keywords. Built once
+    per keyword set in each process.
+    """
+    kw_lower = [keyword.lower() for keyword in keywords]
+    # Equivalent to \b<kw>\b, but leading with the literal lets the regex engine jump
+    # between occurrences with its fast prefix search instead of trying every position
+    kw_patterns = [re.compile(re.escape(keyword) + r'(?<=\b' + re.escape(keyword) + r')\b') for keyword in kw_lower]
+
+    automaton = None
+    distinct = list(dict.fromkeys(kw_lower))
+    if ahocorasick is not None and len(distinct) >= aho_corasick_min_keywords and "" not in distinct:
+        trie = ahocorasick.Automaton()
+        for index, keyword in enumerate(distinct):
+            trie.add_word(keyword, (index, len(keyword)))
+        trie.make_automaton()
+        automaton = (trie, [distinct.index(keyword) for keyword in kw_lower], len(distinct))
+
+    return kw_lower, kw_patterns, automaton
+
+def _keyword_counts(content_lower: str, kw_lower: List[str], automaton) -> List[int]:
+    """Non-overlapping occurrence count of each keyword, matching str.count"""
+    if automaton is None:
+        return [content_lower.count(keyword) for keyword in kw_lower]
+
+    trie, positions, size = automaton
+    counts = [0] * size
+    next_start = [0] * size
+    for end, (index, length) in trie.iter(content_lower):
+        if end - length + 1 >= next_start[index]:
+            counts[index] += 1
+            next_start[index] = end + 1
+    return [counts[index] for index in positions]
+
+def _score_text(content: str, keywords: Tuple[str, ...], aho_corasick_min_keywords: int) -> int:
+    """
+    Relevance score of content for keywords. A pure module-level function so that
+    large pages can be scored in a worker process.
+    """
+    kw_lower, kw_patterns, automaton = _keyword_matchers(keywords, aho_corasick_min_keywords)
+
+    # The one lowered copy of the page; every scan below searches it in place. Case-insensitive
+    # regexes over the original text would avoid the copy but scan several times slower.
+    content_lower = content.lower()
+    base_score = 0
+    # Lowering can change the length of some characters ('İ' becomes two), and short lines are
+    # measured in the original text, so such pages are checked line by line instead
+    lines = content.split('\n') if len(content_lower) != len(content) else None
+
+    counts = _keyword_counts(content_lower, kw_lower, automaton)
+
+    for keyword_lower, exact_pattern, count in zip(kw_lower, kw_patterns, counts):
+        # Every other bonus needs at least one occurrence, so absent keywords end here
+        if not count:
+            continue
+
+        base_score += count * 2
+
+        exact_matches = len(exact_pattern.findall(content_lower))
+        base_score += exact_matches * 3
+
+        if content_lower.find(keyword_lower, 0, 500) != -1:
+            base_score += 10
+
+        if lines is None:
+            short_lines = _count_short_lines(content_lower, keyword_lower)
+        else:
+            short_lines = sum(1 for line in lines if len(line) < 100 and keyword_lower in line.lower().strip())
+        base_score += short_lines * 15
+
+    content_length = len(content)
+    if content_length < 500:
+        base_score = int(base_score * 0.7)
+
+    if content_length > 1000:
+        base_score = int(base_score * 1.2)
+    if content_length > 3000:
+        base_score = int(base_score * 1.5)
+        
+    return base_score
+
 class WebScraper:
     """Enhanced web scraper with better content relevance scoring"""
+
+    max_cached_scores = 4096
+    # Tried in order; the first selector with any element holding over 100 characters supplies the content
+    content_selectors = (
+        'main', 'article', '#content', '.content', '#main-content', '.main-content',
+        '.post', '.entry', '.article', '.page-content', '.entry-content',
+        '[role="main"]', '.main', '#main'
+    )
+    # Below this many keywords one str.count per keyword beats a single Aho-Corasick pass
+    aho_corasick_min_keywords = 16
+    # Smaller pages score faster in-process than the round trip to a worker process costs
+    process_pool_min_chars = 50000
     
     def __init__(self, keywords: List[str]):
         self.keywords = keywords
+        self._keywords = tuple(keywords)
+        self._score_cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._score_pool: Optional[ProcessPoolExecutor] = None
+        self._robots: Dict[str, "asyncio.Future[Optional[RobotFileParser]]"] = {}
         self.base_domain = ""  
         self.base_url = ""     
+        self._base_for_join = ""
 
     async def crawl_with_score_criteria(self, context: BrowserContext, start_url: str, 
                                     max_depth: int = 2, min_score: int = 100,
-                                    cumulative_score_threshold: int = 300) -> List[Dict]:
+                                    cumulative_score_threshold: int = 300,
+                                    concurrency: int = 5, block_resources: bool = True,
+                                    output_dir: Optional[str] = None, top_k: Optional[int] = None,
+                                    probe: bool = True, score_workers: int = 0) -> List[Dict]:
         """
         Crawl the website with score-based collection and early stopping.
+        - Fetches up to `concurrency` pages at a time, highest priority links first
+        - Skips images, media, fonts and ad/tracker requests unless block_resources is False
+        - Saves each collected page as JSON in output_dir when it is given
+        - Unless probe is False, checks robots.txt and sends a HEAD request before rendering a URL,
+          skipping disallowed, missing and non-HTML URLs
+        - Scores large pages in a pool of score_workers processes when score_workers > 0,
+          keeping the event loop free for other fetches
         - Collects pages with score >= min_score
+        - Keeps only the top_k highest scoring pages when top_k is given
         - Stops when the cumulative score of collected pages reaches cumulative_score_threshold
         """
         parsed_url = urlparse(start_url)
@@ -39,113 +273,277 @@ class WebScraper:
                 self.base_domain = start_url.split('/', 1)[0]
                 self.base_url = 'https://' + self.base_domain
             
-        visited = set()
-        queue = [(start_url, 0)]
-        collected_pages = []
-        stop_crawling = False
-        cumulative_score = 0
+        self._base_for_join = self.base_url + '/'
+
+        if block_resources:
+            await context.route("**/*", self._route_request)
+
+        session = None
+        self._robots = {}
+        writes = []
+        in_flight = set()
+        page_pool = asyncio.Queue()
+
+        # Everything started below is released in the finally block, also when the crawl is cancelled
+        try:
+            if probe:
+                session = aiohttp.ClientSession(headers={"User-Agent": USER_AGENT},
+                                                timeout=aiohttp.ClientTimeout(total=5))
+
+            if score_workers > 0:
+                # The process already runs executor and resolver threads, which fork() can deadlock on
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._score_pool = ProcessPoolExecutor(max_workers=score_workers,
+                                                       mp_context=multiprocessing.get_context(start_method))
+
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            visited = set()
+            counter = itertools.count()
+            queue = [(0, next(counter), start_url, 0)]
+            # Min-heap of (score, order, page) so the weakest page is evicted first when top_k is set
+            collected_pages = []
+            stop_crawling = False
+            cumulative_score = 0
         
-        logger.info(f"Starting crawl from {start_url} with keywords: {self.keywords}")
-        logger.info(f"Collection threshold: {min_score}, Cumulative score threshold: {cumulative_score_threshold}")
+            logger.info(f"Starting crawl from {start_url} with keywords: {self.keywords}")
+            logger.info(f"Collection threshold: {min_score}, Cumulative score threshold: {cumulative_score_threshold}")
         
-        while queue and not stop_crawling:
-            current_url, depth = queue.pop(0)
-            logger.info(f"Checking URL: {current_url} (depth {depth}/{max_depth})")
-            
-            if current_url in visited:
-                continue
-                
-            if depth > max_depth:
-                continue
-
-            normalized_url = self._normalize_url(current_url)
-            if not normalized_url:
-                logger.warning(f"Skipping invalid URL: {current_url}")
-                continue
+            # Only this loop touches the queue, visited set and collected pages; the fetch
+            # tasks just return their results, so no locking is needed.
+            while (queue or in_flight) and not stop_crawling:
+                while queue and len(in_flight) < concurrency:
+                    _, _, current_url, depth = heapq.heappop(queue)
+                    logger.info(f"Checking URL: {current_url} (depth {depth}/{max_depth})")
                 
-            visited.add(normalized_url)
-            
-            try:
-                page = await context.new_page()
-                await page.goto(normalized_url, timeout=45000, wait_until="domcontentloaded")
+                    if depth > max_depth:
+                        continue
 
-                if await self._is_valid_page(page):
-                    content = await self._extract_content(page)
+                    normalized_url = self._normalize_url(current_url)
+                    if not normalized_url:
+                        logger.warning(f"Skipping invalid URL: {current_url}")
+                        continue
 
-                    relevance_score = self._check_relevance(content)
-                    page_title = await self._get_page_title(page)
-                    
-                    logger.info(f"Page: {normalized_url} | Title: {page_title} | Score: {relevance_score}")
+                    canonical_url = self._canonicalize(normalized_url)
+                    if canonical_url in visited:
+                        continue
                     
+                    visited.add(canonical_url)
+                    in_flight.add(asyncio.ensure_future(self._fetch_page(context, page_pool, session, normalized_url, depth, max_depth)))
+
+                if not in_flight:
+                    break
+
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    result = task.result()
+                    if result is None or stop_crawling:
+                        continue
+
+                    relevance_score = result["relevance_score"]
                     if relevance_score >= min_score:
-                        logger.info(f"Relevant content found at {normalized_url} (score: {relevance_score})")
-                        
+                        logger.info(f"Relevant content found at {result['url']} (score: {relevance_score})")
+                    
                         page_data = {
-                            "url": normalized_url, 
-                            "title": page_title,
-                            "content": content,
+                            "url": result["url"], 
+                            "title": result["title"],
+                            "content": result["content"],
                             "relevance_score": relevance_score
                         }
-                        
-                        collected_pages.append(page_data)
+                    
+                        heapq.heappush(collected_pages, (relevance_score, next(counter), page_data))
+                        if output_dir:
+                            # File writes run on the default executor so the event loop keeps scheduling fetches
+                            writes.append(asyncio.get_running_loop().run_in_executor(
+                                None, self._write_page, output_dir, page_data))
                         cumulative_score += relevance_score
-                        
+                        if top_k is not None and len(collected_pages) > top_k:
+                            evicted_score, _, _ = heapq.heappop(collected_pages)
+                            cumulative_score -= evicted_score
+                    
                         logger.info(f"Current cumulative score: {cumulative_score}/{cumulative_score_threshold}")
 
                         if cumulative_score >= cumulative_score_threshold:
                             logger.info(f"Reached cumulative score threshold of {cumulative_score_threshold}. Stopping crawl.")
                             stop_crawling = True
+                            continue
 
-                    if depth < max_depth and not stop_crawling:
-                        links = await self._extract_links(page)
-                        same_domain_links = []
-                        external_links = []
-                        
-                        for link in links:
-                            if link not in visited:
-                                if self.base_domain in link:
-                                    same_domain_links.append((link, depth + 1))
-                                else:
-                                    external_links.append((link, depth + 1))
-
-                        queue.extend(same_domain_links)
-                        queue.extend(external_links)
-            
-            except Exception as e:
-                logger.error(f"Failed at {normalized_url}: {str(e)}")
-            finally:
-                await page.close()
+                    next_depth = result["depth"] + 1
+                    for link, anchor_text in result["links"]:
+                        if self._canonicalize(link) not in visited:
+                            priority = self._link_priority(link, anchor_text, next_depth)
+                            heapq.heappush(queue, (-priority, next(counter), link, next_depth))
+
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            if writes:
+                await asyncio.gather(*writes, return_exceptions=True)
+            if self._score_pool is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self._score_pool.shutdown)
+                self._score_pool = None
+            if session is not None:
+                for robots in self._robots.values():
+                    robots.cancel()
+                await session.close()
+            while not page_pool.empty():
+                page = page_pool.get_nowait()
+                if not page.is_closed():
+                    await page.close()
+            if block_resources:
+                await context.unroute("**/*", self._route_request)
                 
         logger.info(f"Crawl completed. Collected {len(collected_pages)} relevant pages with cumulative score of {cumulative_score}.")
 
-        collected_pages.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        return collected_pages
-    
-    async def _is_valid_page(self, page: Page) -> bool:
-        """Check if the page is valid and has content"""
+        if top_k is not None:
+            ranked = heapq.nlargest(top_k, collected_pages, key=lambda entry: (entry[0], -entry[1]))
+        else:
+            ranked = sorted(collected_pages, key=lambda entry: (-entry[0], entry[1]))
+        return [page for _, _, page in ranked]
+
+    def _write_page(self, output_dir: str, page_data: Dict):
+        """Write a collected page to output_dir as <url digest>.json"""
+        name = hashlib.blake2b(page_data["url"].encode("utf-8"), digest_size=16).hexdigest()
+        path = os.path.join(output_dir, f"{name}.json")
         try:
-            body = await page.query_selector('body')
-            if not body:
-                return False
-            status = await page.evaluate("() => document.querySelector('body').innerText")
-            error_phrases = ["404", "not found", "access denied", "forbidden", 
-                            "error", "unavailable", "sorry"]
-            
-            if status and len(status) < 100:  
-                status_lower = status.lower()
-                if any(phrase in status_lower for phrase in error_phrases):
-                    return False
-            
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(page_data))
+        except OSError as e:
+            logger.error(f"Failed to write {page_data['url']} to {path}: {e}")
+
+    async def _should_render(self, session: aiohttp.ClientSession, url: str) -> bool:
+        """Cheap checks before rendering: robots.txt, then a HEAD request for missing or non-HTML URLs"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if origin not in self._robots:
+            self._robots[origin] = asyncio.ensure_future(self._load_robots(session, origin))
+        robots = await asyncio.shield(self._robots[origin])
+        if robots is not None and not robots.can_fetch(USER_AGENT, url):
+            logger.info(f"Skipping {url}: disallowed by robots.txt")
+            return False
+
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                status = response.status
+                content_type = response.headers.get("Content-Type", "").lower()
+        except Exception as e:
+            # Some servers mishandle HEAD; leave the decision to the browser
+            logger.debug(f"HEAD probe failed for {url}: {e}")
             return True
-        except Exception:
+
+        if status in (404, 410):
+            logger.info(f"Skipping {url}: HTTP {status}")
             return False
+        if content_type and "html" not in content_type and "xml" not in content_type:
+            logger.info(f"Skipping {url}: not an HTML page ({content_type})")
+            return False
+        return True
+
+    async def _load_robots(self, session: aiohttp.ClientSession, origin: str) -> Optional[RobotFileParser]:
+        """Fetch and parse robots.txt for origin; None means no restrictions"""
+        try:
+            async with session.get(f"{origin}/robots.txt") as response:
+                if response.status != 200:
+                    return None
+                text = await response.text(errors="replace")
+        except Exception as e:
+            logger.debug(f"Could not fetch robots.txt for {origin}: {e}")
+            return None
+
+        robots = RobotFileParser()
+        robots.parse(text.splitlines())
+        return robots
+
+    async def _route_request(self, route: Route):
+        """Abort requests for resources that do not contribute to the page text"""
+        request = route.request
+        if (request.resource_type in _BLOCKED_RESOURCE_TYPES
+                or _AD_HOST_RE.search(urlparse(request.url).hostname or "")):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _fetch_page(self, context: BrowserContext, page_pool: asyncio.Queue,
+                          session: Optional[aiohttp.ClientSession], url: str,
+                          depth: int, max_depth: int) -> Optional[Dict]:
+        """
+        Load a single page and return its title, content, score and outgoing links.
+        Reuses an idle page from page_pool, opening a new one only when none is free,
+        so at most `concurrency` pages exist during a crawl.
+        """
+        page = None
+        try:
+            if session is not None and not await self._should_render(session, url):
+                return None
+
+            while not page_pool.empty() and page is None:
+                page = page_pool.get_nowait()
+                if page.is_closed():
+                    page = None
+            if page is None:
+                page = await context.new_page()
+            await page.goto(url, timeout=45000, wait_until="domcontentloaded")
+
+            page_data = await self._extract_page_data(page, include_links=depth < max_depth)
+            if not self._is_valid_page(page_data):
+                return None
+
+            content = page_data["content"]
+            logger.debug(f"Content for {url} taken from {page_data.get('contentSelector') or 'paragraphs/body'}")
+
+            relevance_score = await self._score_page(content)
+            page_title = page_data["title"]
+            
+            logger.info(f"Page: {url} | Title: {page_title} | Score: {relevance_score}")
+
+            links = self._extract_links(page_data)
+
+            return {
+                "url": url,
+                "title": page_title,
+                "content": content,
+                "relevance_score": relevance_score,
+                "depth": depth,
+                "links": links
+            }
+        
+        except Exception as e:
+            logger.error(f"Failed at {url}: {str(e)}")
+            return None
+        finally:
+            if page is not None:
+                page_pool.put_nowait(page)
     
-    async def _get_page_title(self, page: Page) -> str:
-        """Extract the page title"""
+    async def _extract_page_data(self, page: Page, include_links: bool) -> Optional[Dict]:
+        """Read the title, validity check text, content and links of a page in one browser round trip"""
         try:
-            return await page.title()
-        except Exception:
-            return "Unknown Title"
+            return await page.evaluate(_EXTRACT_PAGE_JS, {
+                "includeLinks": include_links,
+                "contentSelectors": list(self.content_selectors),
+            })
+        except Exception as e:
+            logger.error(f"Error extracting page data: {e}")
+            return None
+
+    def _is_valid_page(self, page_data: Optional[Dict]) -> bool:
+        """Check if the page is valid and has content"""
+        if not page_data or not page_data.get("hasBody"):
+            return False
+
+        status = page_data.get("shortBodyText")
+        error_phrases = ["404", "not found", "access denied", "forbidden", 
+                        "error", "unavailable", "sorry"]
+        
+        if status and len(status) < 100:  
+            status_lower = status.lower()
+            if any(phrase in status_lower for phrase in error_phrases):
+                return False
+        
+        return True
     
     def _normalize_url(self, url: str) -> str:
         """Normalize URL to absolute format"""
@@ -155,81 +553,53 @@ class WebScraper:
         if url.startswith(('javascript:', 'mailto:', 'tel:', '#')):
             return ""
 
-        if not url.startswith(('http://', 'https://')):
-            if url.startswith('//'):
-                return f"https:{url}"
-            elif url.startswith('/'):
-                return f"{self.base_url}{url}"
-            else:
-                return f"{self.base_url}/{url}"
-                
-        return url
-            
-    async def _extract_content(self, page: Page) -> str:
-        """Extract meaningful content from page with improved targeting"""
         try:
-            await page.evaluate("""
-                () => {
-                    // Remove common non-content elements
-                    const elementsToRemove = document.querySelectorAll('nav, footer, header, .menu, #menu, .navigation, .sidebar, #sidebar, .ads, .advertisement');
-                    elementsToRemove.forEach(el => {
-                        if (el) el.style.display = 'none';
-                    });
-                }
-            """)
-
-            content_selectors = [
-                'main', 'article', '#content', '.content', '#main-content', '.main-content',
-                '.post', '.entry', '.article', '.page-content', '.entry-content', 
-                '[role="main"]', '.main', '#main'
-            ]
-            
-            for selector in content_selectors:
-                elements = await page.query_selector_all(selector)
-                if elements:
-                    texts = []
-                    for element in elements:
-                        text = await element.inner_text()
-                        if text and len(text) > 100:
-                            texts.append(text)
-                    if texts:
-                        return "\n\n".join(texts)
-
-            paragraphs = await page.query_selector_all('p')
-            if paragraphs:
-                texts = []
-                for p in paragraphs:
-                    text = await p.inner_text()
-                    if text and len(text) > 20:  
-                        texts.append(text)
-                if texts:
-                    return "\n\n".join(texts)
-
-            return await page.inner_text('body')
-            
-        except Exception as e:
-            logger.error(f"Error extracting content: {e}")
+            normalized = _join_url(self._base_for_join, url)
+        except ValueError:
+            # Malformed hrefs such as "http://[foo" make urljoin raise; skip just that link
             return ""
+        if not normalized[:8].lower().startswith(('http://', 'https://')):
+            return ""
+                
+        return normalized
             
-    async def _extract_links(self, page: Page) -> List[str]:
-        """Extract all valid links from the page"""
-        try:
-            all_links = []
-            link_elements = await page.query_selector_all('a[href]')
-            
-            for link_el in link_elements:
-                href = await link_el.get_attribute('href')
-                if not href:
-                    continue
-                    
-                normalized_url = self._normalize_url(href)
-                if normalized_url and normalized_url not in all_links:
-                    all_links.append(normalized_url)
-                    
-            return all_links
-        except Exception as e:
-            logger.error(f"Error extracting links: {e}")
-            return []
+    def _canonicalize(self, url: str) -> str:
+        """
+        Canonical form of an absolute URL, used only as the duplicate detection key: lowercase
+        scheme and host, no default port, no fragment, sorted query parameters and "/" for an
+        empty path. Pages are still fetched and reported under their original URL.
+        """
+        return _canonical_url(url)
+
+    def _extract_links(self, page_data: Dict) -> List[Tuple[str, str]]:
+        """Normalize and deduplicate the links found on the page, keeping their anchor text"""
+        all_links = []
+        seen = set()
+        
+        for href, anchor_text in page_data.get("links", []):
+            if not href:
+                continue
+                
+            normalized_url = self._normalize_url(href)
+            if not normalized_url:
+                continue
+
+            canonical_url = self._canonicalize(normalized_url)
+            if canonical_url not in seen:
+                seen.add(canonical_url)
+                all_links.append((normalized_url, anchor_text))
+                
+        return all_links
+
+    def _link_priority(self, url: str, anchor_text: str, depth: int) -> int:
+        """
+        Crawl priority of a link: keyword hits in its URL and anchor text,
+        a bonus for staying on the start domain and a penalty for depth
+        """
+        text = f"{url} {anchor_text}".lower()
+        keyword_hits = sum(1 for keyword in self.keywords if keyword.lower() in text)
+        same_domain_bonus = 5 if self.base_domain in url else 0
+        return keyword_hits * 10 + same_domain_bonus - depth
     
     def _check_relevance(self, content: str) -> int:
         """
@@ -238,37 +608,42 @@ class WebScraper:
         """
         if not content or len(content) < 100:
             return 0
-            
-        content_lower = content.lower()
-        base_score = 0
 
-        for keyword in self.keywords:
-            keyword_lower = keyword.lower()
+        key = self._score_key(content)
+        if key in self._score_cache:
+            self._score_cache.move_to_end(key)
+            return self._score_cache[key]
 
-            count = content_lower.count(keyword_lower)
-            base_score += count * 2
+        return self._remember_score(key, self._score_content(content))
 
-            exact_pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-            exact_matches = len(re.findall(exact_pattern, content_lower))
-            base_score += exact_matches * 3
+    async def _score_page(self, content: str) -> int:
+        """_check_relevance, handing large pages to the score pool when one is running"""
+        if self._score_pool is None or len(content) < self.process_pool_min_chars:
+            return self._check_relevance(content)
 
-            intro = content_lower[:500]
-            if keyword_lower in intro:
-                base_score += 10
+        key = self._score_key(content)
+        if key in self._score_cache:
+            self._score_cache.move_to_end(key)
+            return self._score_cache[key]
 
-            lines = content.split('\n')
-            for line in lines:
-                line_lower = line.lower().strip()
-                if keyword_lower in line_lower and len(line) < 100:
-                    base_score += 15
+        score = await asyncio.get_running_loop().run_in_executor(
+            self._score_pool, _score_text, content, self._keywords, self.aho_corasick_min_keywords)
+        return self._remember_score(key, score)
 
-        content_length = len(content)
-        if content_length < 500:
-            base_score = int(base_score * 0.7)
+    def _score_key(self, content: str) -> bytes:
+        """
+        Score cache key. Templated and paginated pages often extract to identical text;
+        keying on a digest keeps the cache from holding whole pages alive.
+        """
+        return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
 
-        if content_length > 1000:
-            base_score = int(base_score * 1.2)
-        if content_length > 3000:
-            base_score = int(base_score * 1.5)
-            
-        return base_score
\ No newline at end of file
+    def _remember_score(self, key: bytes, score: int) -> int:
+        """Cache the score for key, evicting the least recently used entry"""
+        self._score_cache[key] = score
+        if len(self._score_cache) > self.max_cached_scores:
+            self._score_cache.popitem(last=False)
+        return score
+
+    def _score_content(self, content: str) -> int:
+        """Score content against the keywords by counts, whole-word matches, the intro and short lines"""
+        return _score_text(content, self._keywords, self.aho_corasick_min_keywords)
\ No newline at end of file
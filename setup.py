@@ -12,7 +12,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/nikhilmalkari8/rufus-web-crawler",
-    packages=find_packages(),
+    packages=find_packages(include=["rufus", "rufus.*"]),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -21,10 +21,16 @@ setup(
     python_requires=">=3.7",
     install_requires=[
         "playwright>=1.20.0",
-        "openai>=0.27.0",
+        "openai>=0.27.0,<1.0",
         "nltk>=3.6.0",
         "asyncio>=3.4.3",
+        "orjson>=3.6.0",
+        "tiktoken>=0.4.0",
+        "aiohttp>=3.8.0",
     ],
+    extras_require={
+        "fast": ["uvloop>=0.18.0; sys_platform != 'win32'", "pyahocorasick>=2.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "rufus=rufus.client:cli_main",
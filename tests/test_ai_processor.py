@@ -0,0 +1,115 @@
+import asyncio
+import openai
+from types import SimpleNamespace
+from rufus.ai_processor import AIContentProcessor, SemanticCache, _count_tokens
+
+def test_semantic_cache_reuses_similar_prompts(tmp_path):
+    cache = SemanticCache(threshold=0.92, cache_dir=str(tmp_path))
+    namespace = cache.namespace("gpt-4", 0.3)
+
+    cache.add(namespace, [1.0, 0.0, 0.0], "summarize burgers", "Burgers summary")
+
+    assert cache.lookup(namespace, [0.99, 0.05, 0.0]) == "Burgers summary"
+    assert cache.lookup(namespace, [0.5, 0.5, 0.0]) is None
+    assert cache.lookup(cache.namespace("gpt-4", 0.7), [1.0, 0.0, 0.0]) is None
+
+    reloaded = SemanticCache(cache_dir=str(tmp_path))
+    assert reloaded.lookup(namespace, [2.0, 0.0, 0.0]) == "Burgers summary"
+
+def test_semantic_cache_skips_expired_entries():
+    cache = SemanticCache(ttl=-1)
+    namespace = cache.namespace("gpt-4", 0.3)
+
+    cache.add(namespace, [1.0, 0.0], "prompt", "stale")
+
+    assert cache.lookup(namespace, [1.0, 0.0]) is None
+
+def test_semantic_cache_keeps_newest_entries(tmp_path):
+    cache = SemanticCache(cache_dir=str(tmp_path), max_entries=2)
+    namespace = cache.namespace("gpt-4", 0.3)
+
+    cache.add(namespace, [1.0, 0.0, 0.0], "first", "first response")
+    cache.add(namespace, [0.0, 1.0, 0.0], "second", "second response")
+    asyncio.run(cache.add_async(namespace, [0.0, 0.0, 1.0], "third", "third response"))
+
+    for current in (cache, SemanticCache(cache_dir=str(tmp_path), max_entries=2)):
+        assert current.lookup(namespace, [1.0, 0.0, 0.0]) is None
+        assert current.lookup(namespace, [0.0, 1.0, 0.0]) == "second response"
+        assert current.lookup(namespace, [0.0, 0.0, 1.0]) == "third response"
+
+def test_chunk_content_respects_token_budget():
+    processor = AIContentProcessor(api_key="test")
+    content = "\n\n".join(f"Paragraph {i} about burgers and fries. " * 20 for i in range(40))
+
+    chunks = processor._chunk_content(content, max_tokens=500)
+
+    assert len(chunks) > 1
+    assert "\n\n".join(chunks) == content
+    assert all(_count_tokens(chunk) <= 500 for chunk in chunks)
+    assert processor._chunk_content("short page", max_tokens=500) == ["short page"]
+
+def test_chunk_content_counts_paragraph_breaks():
+    processor = AIContentProcessor(api_key="test")
+    content = "\n\n".join(f"Fries ${i % 10}.99" for i in range(2000))
+
+    chunks = processor._chunk_content(content, max_tokens=500)
+
+    assert len(chunks) > 1
+    assert "\n\n".join(chunks) == content
+    assert all(_count_tokens(chunk) <= 500 for chunk in chunks)
+
+def test_extract_key_points_keeps_text_after_bullet_marker():
+    processor = AIContentProcessor(api_key="test")
+    summary = "Overview of the menu.\n- 0.5% fat in the patty\n  * Cheese burger for $5  \n12. 3 sides included\n• Vegan options\n-----\n-ok"
+
+    assert processor._extract_key_points(summary) == [
+        "0.5% fat in the patty",
+        "Cheese burger for $5",
+        "3 sides included",
+        "Vegan options",
+    ]
+
+def test_extract_key_points_falls_back_to_sentences():
+    processor = AIContentProcessor(api_key="test")
+    summary = "The restaurant serves burgers all day. Fries come with every order. Ok."
+
+    assert processor._extract_key_points(summary) == [
+        "The restaurant serves burgers all day.",
+        "Fries come with every order.",
+    ]
+
+def test_process_content_runs_under_separate_event_loops(monkeypatch):
+    async def fake_acreate(**request):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="- Burgers are served all day"))])
+
+    monkeypatch.setattr(openai.ChatCompletion, "acreate", fake_acreate)
+    processor = AIContentProcessor(api_key="test", max_concurrent_requests=1)
+    page = {"url": "https://ex.com/menu", "content": "\n\n".join("Burger menu item. " * 60 for _ in range(50))}
+
+    for _ in range(2):
+        result = asyncio.run(processor.process_content(page, "burgers"))
+        assert "Error" not in result["summary"]
+        assert result["key_points"][0] == "Burgers are served all day"
+
+def test_chunk_content_splits_oversized_paragraphs():
+    processor = AIContentProcessor(api_key="test")
+    lines = "\n".join(f"Menu item {i}: classic cheese burger with fries" for i in range(3000))
+    content = lines + "\n\n" + "burger" * 5000
+
+    chunks = processor._chunk_content(content, max_tokens=500)
+
+    assert len(chunks) > 1
+    assert all(_count_tokens(chunk) <= 500 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "").replace(" ", "") == content.replace("\n", "").replace(" ", "")
+
+def test_semantic_cache_separates_embedding_models(tmp_path):
+    small = SemanticCache(cache_dir=str(tmp_path), embedding_model="text-embedding-3-small")
+    large = SemanticCache(cache_dir=str(tmp_path), embedding_model="text-embedding-3-large")
+    namespace = small.namespace("gpt-4", 0.3)
+
+    small.add(namespace, [1.0, 0.0], "summarize burgers", "Burgers summary")
+
+    assert large.namespace("gpt-4", 0.3) != namespace
+    assert small.lookup(namespace, [1.0, 0.0, 0.0, 0.0]) is None
+    assert small.lookup(namespace, [1.0, 0.0]) == "Burgers summary"
@@ -0,0 +1,25 @@
+import pytest
+import openai
+from types import SimpleNamespace
+from rufus.llm_cache import LLMCache, cached_chat
+
+@pytest.mark.asyncio
+async def test_cached_chat_reuses_identical_requests(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_acreate(**request):
+        calls.append(request)
+        message = SimpleNamespace(content=f"response {len(calls)}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(openai.ChatCompletion, "acreate", fake_acreate)
+    cache = LLMCache(str(tmp_path))
+    messages = [{"role": "user", "content": "summarize burgers"}]
+
+    first = await cached_chat(cache, model="gpt-4", messages=messages, temperature=0.3, api_key="a")
+    second = await cached_chat(cache, model="gpt-4", messages=messages, temperature=0.3, api_key="b")
+    other = await cached_chat(cache, model="gpt-4", messages=messages, temperature=0.7, api_key="a")
+
+    assert first == second == "response 1"
+    assert other == "response 2"
+    assert len(calls) == 2
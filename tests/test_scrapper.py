@@ -1,6 +1,8 @@
 import pytest
 import asyncio
-from rufus.scraper import WebScraper
+import random
+import re
+from rufus.scraper import WebScraper, _canonical_url
 from playwright.async_api import async_playwright
 
 @pytest.mark.asyncio
@@ -26,3 +28,220 @@ async def test_scraper():
         assert "example" in results[0]["content"].lower()
         
         await browser.close()
+
+def _scraper_for(base_url):
+    scraper = WebScraper(["burger"])
+    scraper.base_url = base_url
+    scraper._base_for_join = base_url + '/'
+    return scraper
+
+def test_normalize_url_resolves_relative_links():
+    scraper = _scraper_for("https://ex.com")
+
+    assert scraper._normalize_url("/menu") == "https://ex.com/menu"
+    assert scraper._normalize_url("menu/burgers") == "https://ex.com/menu/burgers"
+    assert scraper._normalize_url("../about") == "https://ex.com/about"
+    assert scraper._normalize_url("?page=2") == "https://ex.com/?page=2"
+    assert scraper._normalize_url("//cdn.ex.com/a") == "https://cdn.ex.com/a"
+    assert scraper._normalize_url("https://other.com/x") == "https://other.com/x"
+
+def test_normalize_url_skips_unfollowable_links():
+    scraper = _scraper_for("https://ex.com")
+
+    for href in ["", "#top", "mailto:a@ex.com", "javascript:void(0)", "tel:123", "ftp://ex.com/f", "http://[foo"]:
+        assert scraper._normalize_url(href) == ""
+
+def test_extract_links_skips_malformed_hrefs():
+    scraper = _scraper_for("https://ex.com")
+
+    links = scraper._extract_links({"links": [["https://ex.com/menu", "Menu"], ["http://[foo", "bad"]]})
+
+    assert links == [("https://ex.com/menu", "Menu")]
+
+def test_canonicalize():
+    scraper = WebScraper([])
+
+    assert scraper._canonicalize("HTTPS://Ex.COM") == "https://ex.com/"
+    assert scraper._canonicalize("https://ex.com:443/a?b=2&a=1#frag") == "https://ex.com/a?a=1&b=2"
+    assert scraper._canonicalize("http://ex.com:80/") == "http://ex.com/"
+    assert scraper._canonicalize("http://ex.com:8080/x/") == "http://ex.com:8080/x/"
+    assert scraper._canonicalize("https://ex.com/?q=a%20b&z") == "https://ex.com/?q=a%20b&z"
+    assert scraper._canonicalize("") == ""
+
+def _baseline_relevance(keywords, content):
+    """The original per-keyword, per-line scorer that _score_text must agree with"""
+    if not content or len(content) < 100:
+        return 0
+    content_lower = content.lower()
+    base_score = 0
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+        base_score += content_lower.count(keyword_lower) * 2
+        base_score += len(re.findall(r'\b' + re.escape(keyword_lower) + r'\b', content_lower)) * 3
+        if keyword_lower in content_lower[:500]:
+            base_score += 10
+        for line in content.split('\n'):
+            if keyword_lower in line.lower().strip() and len(line) < 100:
+                base_score += 15
+    if len(content) < 500:
+        base_score = int(base_score * 0.7)
+    if len(content) > 1000:
+        base_score = int(base_score * 1.2)
+    if len(content) > 3000:
+        base_score = int(base_score * 1.5)
+    return base_score
+
+def test_relevance_score_matches_baseline_scorer():
+    rng = random.Random(7)
+    words = ["burger", "Burgers", "cheese", "cheeseburger", "menu", "MENU", "fries", "aa", "a",
+             "the", "burger-king", "İstanbul", "é", "c++", "\n", "\n\n", "  ", ""]
+    keyword_sets = [["burger", "menu"], ["Burger", "cheese burger"], ["burger", "burg"], ["aa", "a"],
+                    ["menu", "menu"], ["c++", "x.y"], ["istanbul", "é"], [""]]
+
+    for _ in range(1500):
+        keywords = rng.choice(keyword_sets)
+        content = " ".join(rng.choice(words) for _ in range(rng.choice([20, 80, 200, 600, 1500])))
+        assert WebScraper(keywords)._check_relevance(content) == _baseline_relevance(keywords, content)
+
+def test_extract_links_dedupes_by_canonical_form_but_keeps_original_urls():
+    scraper = _scraper_for("https://ex.com")
+
+    links = scraper._extract_links({"links": [
+        ["https://ex.com/dl?sig=abc&expires=1#part", "Download"],
+        ["https://EX.com:443/dl?expires=1&sig=abc", "Again"],
+        ["/menu", "Menu"],
+    ]})
+
+    assert links == [("https://ex.com/dl?sig=abc&expires=1#part", "Download"), ("https://ex.com/menu", "Menu")]
+
+class _FakePage:
+    """Playwright Page stand-in serving pages from a _FakeContext's site map"""
+
+    def __init__(self, context):
+        self.context = context
+        self.url = None
+        self.closed = False
+
+    async def goto(self, url, **kwargs):
+        await asyncio.sleep(self.context.delay)
+        self.context.gotos.append(url)
+        self.url = url
+
+    async def evaluate(self, script, arg):
+        score, links = self.context.site[_canonical_url(self.url)]
+        return {
+            "hasBody": True,
+            "shortBodyText": None,
+            "title": self.url,
+            "content": f"{score} " + "burger " * 20,
+            "links": links if arg["includeLinks"] else [],
+        }
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+class _FakeContext:
+    """BrowserContext stand-in; site maps canonical URLs to (relevance score, [[href, anchor text]])"""
+
+    def __init__(self, site, delay=0):
+        self.site = site
+        self.delay = delay
+        self.gotos = []
+        self.pages = []
+        self.routes = []
+
+    async def new_page(self):
+        page = _FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def unroute(self, pattern, handler):
+        self.routes.remove((pattern, handler))
+
+def _fake_crawler(keywords=("burger",)):
+    scraper = WebScraper(list(keywords))
+
+    async def score_page(content):
+        return int(content.split()[0])
+
+    scraper._score_page = score_page
+    return scraper
+
+@pytest.mark.asyncio
+async def test_crawl_fetches_each_canonical_url_once_in_priority_order():
+    context = _FakeContext({
+        "https://ex.com/": (10, [["/about", "About us"], ["/burger-menu", "Menu"],
+                                 ["/cheese-burger", "Cheese burgers"], ["/burger-menu#top", "Menu"]]),
+        "https://ex.com/cheese-burger": (10, [["https://EX.com:443/burger-menu#x", "Burgers"], ["/", "Home"]]),
+        "https://ex.com/burger-menu": (10, []),
+        "https://ex.com/about": (10, []),
+    })
+    scraper = _fake_crawler(["burger", "cheese"])
+
+    results = await scraper.crawl_with_score_criteria(context, "https://ex.com", max_depth=2, min_score=0,
+                                                      cumulative_score_threshold=1000, concurrency=1, probe=False)
+
+    assert context.gotos == ["https://ex.com", "https://ex.com/cheese-burger",
+                             "https://ex.com/burger-menu", "https://ex.com/about"]
+    assert len(results) == 4
+    assert len(context.pages) == 1 and context.pages[0].closed
+    assert context.routes == []
+
+@pytest.mark.asyncio
+async def test_crawl_stops_at_cumulative_score_threshold():
+    context = _FakeContext({
+        "https://ex.com/": (50, [["/a", "burger a"], ["/b", "burger b"], ["/c", "burger c"]]),
+        "https://ex.com/a": (40, []),
+        "https://ex.com/b": (30, []),
+        "https://ex.com/c": (20, []),
+    })
+    scraper = _fake_crawler()
+
+    results = await scraper.crawl_with_score_criteria(context, "https://ex.com", min_score=0,
+                                                      cumulative_score_threshold=100, concurrency=1, probe=False)
+
+    assert context.gotos == ["https://ex.com", "https://ex.com/a", "https://ex.com/b"]
+    assert [page["relevance_score"] for page in results] == [50, 40, 30]
+    assert all(page.closed for page in context.pages)
+
+@pytest.mark.asyncio
+async def test_crawl_top_k_eviction_lowers_cumulative_score():
+    context = _FakeContext({
+        "https://ex.com/": (50, [["/a", "burger a"], ["/b", "burger b"], ["/c", "burger c"]]),
+        "https://ex.com/a": (40, []),
+        "https://ex.com/b": (30, []),
+        "https://ex.com/c": (60, []),
+    })
+    scraper = _fake_crawler()
+
+    results = await scraper.crawl_with_score_criteria(context, "https://ex.com", min_score=0,
+                                                      cumulative_score_threshold=100, concurrency=1,
+                                                      top_k=1, probe=False)
+
+    # Evicted pages no longer count toward the threshold, so the crawl reaches /c
+    assert context.gotos == ["https://ex.com", "https://ex.com/a", "https://ex.com/b", "https://ex.com/c"]
+    assert [page["url"] for page in results] == ["https://ex.com/c"]
+    assert all(page.closed for page in context.pages)
+
+@pytest.mark.asyncio
+async def test_crawl_closes_pooled_pages_when_cancelled():
+    context = _FakeContext({
+        "https://ex.com/": (10, [[f"/burger-{i}", "burger"] for i in range(10)]),
+        **{f"https://ex.com/burger-{i}": (10, []) for i in range(10)},
+    }, delay=0.05)
+    scraper = _fake_crawler()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scraper.crawl_with_score_criteria(
+            context, "https://ex.com", min_score=0, cumulative_score_threshold=1000, concurrency=3, probe=False
+        ), timeout=0.08)
+
+    assert len(context.pages) == 3
+    assert all(page.closed for page in context.pages)
+    assert context.routes == []